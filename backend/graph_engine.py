@@ -11,14 +11,109 @@ Changes over v3:
 
 import pandas as pd
 import numpy as np
-from collections import defaultdict
+import os
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Set, Tuple, Any
 
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional — kernels below then run as plain Python
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+
+# Detected patterns are tracked per account as a bitmask; besides these, there is
+# one cycle_length_<n> label per cycle length the engine is configured to find
+_NON_CYCLE_PATTERNS = (
+    "fan_in", "fan_out", "fan_in_contributor", "fan_out_receiver",
+    "layered_shell", "high_velocity",
+)
+
+
+def _pattern_bits(cycle_min: int, cycle_max: int) -> Dict[str, int]:
+    labels = [f"cycle_length_{n}" for n in range(cycle_min, cycle_max + 1)]
+    labels += _NON_CYCLE_PATTERNS
+    return {label: 1 << bit for bit, label in enumerate(labels)}
+
+
+def _decode_patterns(mask: int, table: List[Tuple[str, int]]) -> List[str]:
+    # table is (label, bit) in label order, so the result is already sorted
+    return [label for label, bit in table if mask & bit]
+
+
+# ─── JIT KERNELS ──────────────────────────────────────────────────────────────
+@njit(cache=True)
+def _max_in_window_nb(ts_sorted, window_ns):
+    """Max number of int64-ns timestamps falling inside any window of width window_ns."""
+    max_count, j = 0, 0
+    for i in range(ts_sorted.shape[0]):
+        while ts_sorted[i] - ts_sorted[j] > window_ns:
+            j += 1
+        if i - j + 1 > max_count:
+            max_count = i - j + 1
+    return max_count
+
+
+@njit(nogil=True, cache=True)
+def _cycles_from_starts_nb(indptr, indices, lo, hi, min_len, max_len, max_results):
+    """
+    Enumerate simple cycles from each start node in [lo, hi) in order, visiting
+    only successors with a larger id than the start, and stop as soon as
+    max_results cycles have been found across the whole range. Runs without
+    the GIL so several start ranges can be searched from a thread pool at once.
+    Returns the cycles as rows padded with -1, and how many rows are filled.
+    """
+    out = np.full((max_results, max_len), -1, dtype=np.int32)
+    path = np.empty(max_len, dtype=np.int32)
+    cursor = np.empty(max_len, dtype=np.int64)
+    found = 0
+    for start in range(lo, hi):
+        if found >= max_results:
+            break
+        path[0] = start
+        cursor[0] = indptr[start]
+        depth = 1
+        while depth > 0:
+            cur = path[depth - 1]
+            pos = cursor[depth - 1]
+            if pos == indptr[cur + 1]:
+                depth -= 1
+                continue
+            cursor[depth - 1] = pos + 1
+            nxt = indices[pos]
+            if nxt == start:
+                if depth >= min_len:
+                    out[found, :depth] = path[:depth]
+                    found += 1
+                    if found >= max_results:
+                        break
+                continue
+            if nxt > start and depth < max_len:
+                # Paths are at most max_len long, so a scan beats a visited array
+                on_path = False
+                for d in range(depth):
+                    if path[d] == nxt:
+                        on_path = True
+                        break
+                if not on_path:
+                    path[depth] = nxt
+                    cursor[depth] = indptr[nxt]
+                    depth += 1
+    return out, found
+
 
 class GraphEngine:
     CYCLE_MIN = 3
     CYCLE_MAX = 5
     CYCLE_MAX_RESULTS = 500          # hard cap: prevents exponential blowup on dense graphs
+    CYCLE_START_BATCH = 256          # start nodes per DFS kernel call
+    CYCLE_WORKERS = os.cpu_count() or 1
     SMURF_THRESHOLD = 10             # min unique partners for fan-in/out
     SHELL_MAX_TX = 3                 # max total tx for a "shell" node
     SHELL_MIN_CHAIN = 3              # min hops in a shell chain
@@ -36,103 +131,192 @@ class GraphEngine:
         self.adj: Dict[str, Set[str]] = defaultdict(set)
         self.rev: Dict[str, Set[str]] = defaultdict(set)
         self.node_stats: Dict[str, Dict] = {}
-        self.edge_list: List[Dict] = []
-        self._edges_by_source: Dict[str, List[Dict]] = defaultdict(list)
-        self._edges_by_target: Dict[str, List[Dict]] = defaultdict(list)
+        # Per (source, target) pair: largest amount and first/last valid timestamp
+        self._pair_amt_max: Dict[Tuple[str, str], float] = {}
+        self._pair_ts_min: Dict[Tuple[str, str], pd.Timestamp] = {}
+        self._pair_ts_max: Dict[Tuple[str, str], pd.Timestamp] = {}
+        # Integer-encoded graph (CSR): node i's successors are indices[indptr[i]:indptr[i+1]]
+        self._node_ids: List[str] = []
+        self._id_of: Dict[str, int] = {}
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.zeros(0, dtype=np.int32)
+        # The same successor lists as Python int tuples, shared by the DFS and BFS
+        self._adj_sorted: List[Tuple[int, ...]] = []
+        # Edges as parallel arrays (row order), plus per-source / per-target CSR views:
+        # edges out of node i are _by_src[_src_ptr[i]:_src_ptr[i+1]], likewise for targets,
+        # each group ordered by timestamp
+        self._src = np.zeros(0, dtype=np.int32)
+        self._dst = np.zeros(0, dtype=np.int32)
+        self._amt = np.zeros(0, dtype=np.float64)
+        self._ts_ns = np.zeros(0, dtype=np.int64)
+        self._by_src = np.zeros(0, dtype=np.int64)
+        self._by_dst = np.zeros(0, dtype=np.int64)
+        self._src_ptr = np.zeros(1, dtype=np.int64)
+        self._dst_ptr = np.zeros(1, dtype=np.int64)
 
     # ─── BUILD GRAPH ──────────────────────────────────────────────────────────
     def _build_graph(self):
-        stats: Dict[str, Dict] = defaultdict(lambda: {
-            "tx_in": 0, "tx_out": 0,
-            "total_in": 0.0, "total_out": 0.0,
-            "timestamps": [],
-        })
-
-        for _, row in self.df.iterrows():
-            s, r = str(row["sender_id"]), str(row["receiver_id"])
-            amt = float(row["amount"])
-            ts = row["timestamp"]
-
+        # Pull columns out once — iterrows() builds a Series per row
+        senders   = self.df["sender_id"].astype(str).to_numpy()
+        receivers = self.df["receiver_id"].astype(str).to_numpy()
+        amounts   = self.df["amount"].to_numpy(dtype=np.float64)
+        # One UTC conversion, shared by the pair min/max and the edge arrays;
+        # utc=True also accepts columns of datetimes with mixed offsets
+        ts_ns     = pd.to_datetime(self.df["timestamp"].to_numpy(), utc=True).asi8
+
+        # Per-node aggregates in one vectorized groupby pass per direction
+        frame = pd.DataFrame({"sender_id": senders, "receiver_id": receivers, "amount": amounts})
+        out_stats = frame.groupby("sender_id", sort=False).agg(
+            tx_out=("amount", "size"), total_out=("amount", "sum"))
+        in_stats = frame.groupby("receiver_id", sort=False).agg(
+            tx_in=("amount", "size"), total_in=("amount", "sum"))
+        out_map = {nid: (int(n), float(t)) for nid, n, t in out_stats.itertuples()}
+        in_map  = {nid: (int(n), float(t)) for nid, n, t in in_stats.itertuples()}
+
+        # O(1) pair lookups for cycle scoring instead of scanning a sender's edges
+        pairs = ["sender_id", "receiver_id"]
+        self._pair_amt_max = frame.groupby(pairs, sort=False)["amount"].max().to_dict()
+        pair_ts = (frame.assign(ts=ts_ns.view("datetime64[ns]"))
+                   .groupby(pairs, sort=False)["ts"].agg(["min", "max"]))
+        self._pair_ts_min = pair_ts["min"].to_dict()
+        self._pair_ts_max = pair_ts["max"].to_dict()
+
+        # Adjacency from distinct (sender, receiver) pairs — one C-level dedup, no per-group apply
+        distinct = frame.drop_duplicates(pairs)
+        for s, r in zip(distinct["sender_id"].to_numpy(), distinct["receiver_id"].to_numpy()):
             self.adj[s].add(r)
             self.rev[r].add(s)
 
-            stats[s]["tx_out"] += 1
-            stats[s]["total_out"] += amt
-            stats[s]["timestamps"].append(ts)
-
-            stats[r]["tx_in"] += 1
-            stats[r]["total_in"] += amt
-            stats[r]["timestamps"].append(ts)
-
-            edge = {"source": s, "target": r, "amount": amt, "ts": ts}
-            self.edge_list.append(edge)
-            self._edges_by_source[s].append(edge)
-            self._edges_by_target[r].append(edge)
-
-        for nid, st in stats.items():
-            st["tx_total"] = st["tx_in"] + st["tx_out"]
-            st["timestamps"] = sorted([t for t in st["timestamps"] if pd.notna(t)])
-            self.node_stats[nid] = st
-
-        for nid in set(self.adj) | set(self.rev):
-            if nid not in self.node_stats:
-                self.node_stats[nid] = {
-                    "tx_in": 0, "tx_out": 0, "total_in": 0.0,
-                    "total_out": 0.0, "timestamps": [], "tx_total": 0,
-                }
+        # Keep first-seen node order (sender before receiver, row by row)
+        for nid in pd.unique(np.column_stack((senders, receivers)).ravel()):
+            tx_out, total_out = out_map.get(nid, (0, 0.0))
+            tx_in, total_in = in_map.get(nid, (0, 0.0))
+            self.node_stats[nid] = {
+                "tx_in": tx_in, "tx_out": tx_out,
+                "total_in": total_in, "total_out": total_out,
+                "tx_total": tx_in + tx_out,
+            }
+
+        self._encode_edges(senders, receivers, amounts, ts_ns)
+
+    def _encode_edges(self, senders: np.ndarray, receivers: np.ndarray,
+                      amounts: np.ndarray, ts_ns: np.ndarray):
+        # Contiguous int IDs in sorted-name order, so id comparisons match name comparisons
+        self._node_ids = sorted(self.node_stats)
+        self._id_of = {nid: i for i, nid in enumerate(self._node_ids)}
+        n = len(self._node_ids)
+        index = pd.Index(self._node_ids, dtype=object)
+        self._src = index.get_indexer(senders).astype(np.int32)
+        self._dst = index.get_indexer(receivers).astype(np.int32)
+        self._amt = amounts
+        self._ts_ns = ts_ns
+
+        self._by_src = np.lexsort((self._ts_ns, self._src))
+        self._by_dst = np.lexsort((self._ts_ns, self._dst))
+        self._src_ptr = np.searchsorted(self._src[self._by_src], np.arange(n + 1))
+        self._dst_ptr = np.searchsorted(self._dst[self._by_dst], np.arange(n + 1))
+
+        # Unique successors, sorted by (src, dst) — the adjacency CSR
+        pair_keys = np.unique(self._src.astype(np.int64) * n + self._dst)
+        self._indices = (pair_keys % max(n, 1)).astype(np.int32)
+        self._indptr = np.searchsorted(pair_keys // max(n, 1), np.arange(n + 1))
+        indptr, indices = self._indptr.tolist(), self._indices.tolist()
+        self._adj_sorted = [tuple(indices[indptr[i]:indptr[i + 1]]) for i in range(n)]
+
+    def _edges_from(self, nid: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(target ids, amounts, int64-ns timestamps) of nid's outgoing edges."""
+        i = self._id_of[nid]
+        idx = self._by_src[self._src_ptr[i]:self._src_ptr[i + 1]]
+        return self._dst[idx], self._amt[idx], self._ts_ns[idx]
+
+    def _edges_to(self, nid: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(source ids, amounts, int64-ns timestamps) of nid's incoming edges."""
+        i = self._id_of[nid]
+        idx = self._by_dst[self._dst_ptr[i]:self._dst_ptr[i + 1]]
+        return self._src[idx], self._amt[idx], self._ts_ns[idx]
 
     # ─── CYCLE DETECTION ──────────────────────────────────────────────────────
     def _detect_cycles(self) -> List[List[str]]:
-        cycles: List[List[str]] = []
-        all_nodes = sorted(self.node_stats.keys())
-
-        def dfs(start: str, current: str, path: List[str], on_path: Set[str]):
-            # Hard cap: exit immediately once we have enough cycles
-            if len(cycles) >= self.CYCLE_MAX_RESULTS:
-                return
-            if len(path) > self.CYCLE_MAX:
-                return
-            for neighbor in sorted(self.adj.get(current, set())):
-                if len(cycles) >= self.CYCLE_MAX_RESULTS:
-                    return
-                if neighbor == start and len(path) >= self.CYCLE_MIN:
-                    cycles.append(list(path))
-                    continue
-                if (neighbor not in on_path
-                        and neighbor > start):
-                    path.append(neighbor)
-                    on_path.add(neighbor)
-                    dfs(start, neighbor, path, on_path)
-                    path.pop()
-                    on_path.discard(neighbor)
-
-        for node in all_nodes:
+        if HAVE_NUMBA:
+            cycles = self._collect_cycles_parallel()
+        else:
+            cycles = self._collect_cycles()
+
+        # No dedup pass: the DFS only extends to ids above the start, so every cycle
+        # is emitted exactly once, beginning at its smallest member. Distinct cycles
+        # that share a member set are kept as separate rings
+        names = self._node_ids
+        return [[names[i] for i in c] for c in cycles]
+
+    def _collect_cycles_parallel(self) -> List[Tuple[int, ...]]:
+        # The first range runs alone: on dense graphs it usually fills the cap by
+        # itself, and fanning out would only burn work past the cap. Later rounds
+        # give one range to each worker; results merge in start order so the first
+        # CYCLE_MAX_RESULTS match the sequential DFS.
+        cycles: List[Tuple[int, ...]] = []
+        n = len(self._node_ids)
+        step = self.CYCLE_START_BATCH
+        lo, width = 0, 1
+        with ThreadPoolExecutor(max_workers=self.CYCLE_WORKERS) as pool:
+            while lo < n and len(cycles) < self.CYCLE_MAX_RESULTS:
+                remaining = self.CYCLE_MAX_RESULTS - len(cycles)
+                hi = min(n, lo + step * width)
+                ranges = [(a, min(hi, a + step)) for a in range(lo, hi, step)]
+                results = pool.map(
+                    lambda r: _cycles_from_starts_nb(
+                        self._indptr, self._indices, r[0], r[1],
+                        self.CYCLE_MIN, self.CYCLE_MAX, remaining),
+                    ranges)
+                for out, found in results:
+                    for row in out[:found].tolist():
+                        cycles.append(tuple(i for i in row if i >= 0))
+                lo, width = hi, self.CYCLE_WORKERS
+        return cycles[:self.CYCLE_MAX_RESULTS]
+
+    def _collect_cycles(self) -> List[Tuple[int, ...]]:
+        cycles: List[Tuple[int, ...]] = []
+        adj = self._adj_sorted
+        on_path = bytearray(len(adj))   # colour: 0 = white, 1 = grey (on current path)
+
+        # Iterative DFS: path[k] is the node at depth k, stack[k] an iterator over
+        # its remaining successors — no Python frame per visited node
+        for start in range(len(adj)):
             if len(cycles) >= self.CYCLE_MAX_RESULTS:
                 break
-            dfs(node, node, [node], {node})
-
-        # Deduplicate by frozenset of members
-        seen: Set[frozenset] = set()
-        unique: List[List[str]] = []
-        for c in cycles:
-            key = frozenset(c)
-            if key not in seen:
-                seen.add(key)
-                unique.append(c)
-
-        return unique
+            path, stack = [start], [iter(adj[start])]
+            on_path[start] = 1
+            while stack:
+                nxt = next(stack[-1], None)
+                if nxt is None:
+                    stack.pop()
+                    on_path[path.pop()] = 0
+                    continue
+                if nxt == start:
+                    if len(path) >= self.CYCLE_MIN:
+                        cycles.append(tuple(path))
+                        # Hard cap: exit immediately once we have enough cycles
+                        if len(cycles) >= self.CYCLE_MAX_RESULTS:
+                            break
+                    continue
+                if nxt > start and not on_path[nxt] and len(path) < self.CYCLE_MAX:
+                    path.append(nxt)
+                    stack.append(iter(adj[nxt]))
+                    on_path[nxt] = 1
+            for i in path:
+                on_path[i] = 0
+        return cycles
 
     # ─── TEMPORAL WINDOW HELPER ───────────────────────────────────────────────
-    def _max_in_window(self, timestamps: List[pd.Timestamp], window: pd.Timedelta) -> int:
-        if not timestamps:
+    def _max_in_window(self, timestamps, window: pd.Timedelta, assume_sorted: bool = False) -> int:
+        if len(timestamps) == 0:
             return 0
-        ts = sorted(timestamps)
-        max_count, j = 0, 0
-        for i in range(len(ts)):
-            while ts[i] - ts[j] > window:
-                j += 1
-            max_count = max(max_count, i - j + 1)
-        return max_count
+        if isinstance(timestamps, np.ndarray) and timestamps.dtype == np.int64:
+            ts = timestamps
+        else:
+            ts = np.asarray(timestamps, dtype="datetime64[ns]").view(np.int64)
+        if not assume_sorted:
+            ts = np.sort(ts)
+        return int(_max_in_window_nb(ts, np.int64(window.value)))
 
     # ─── AMOUNT DECAY HELPER (layering signal) ────────────────────────────────
     def _has_amount_decay(self, cycle_nodes: List[str]) -> bool:
@@ -141,15 +325,10 @@ class GraphEngine:
         amounts = []
         n = len(cycle_nodes)
         for i in range(n):
-            s = cycle_nodes[i]
-            r = cycle_nodes[(i + 1) % n]
-            edges_between = [
-                e["amount"] for e in self._edges_by_source.get(s, [])
-                if e["target"] == r
-            ]
-            if not edges_between:
+            amt = self._pair_amt_max.get((cycle_nodes[i], cycle_nodes[(i + 1) % n]))
+            if amt is None:
                 return False
-            amounts.append(max(edges_between))
+            amounts.append(amt)
 
         for i in range(1, len(amounts)):
             ratio = amounts[i] / amounts[i - 1] if amounts[i - 1] > 0 else 1
@@ -159,17 +338,16 @@ class GraphEngine:
 
     # ─── CYCLE TEMPORAL SCORE ─────────────────────────────────────────────────
     def _cycle_temporal_score(self, cycle_nodes: List[str]) -> float:
-        timestamps = []
+        firsts, lasts = [], []
         n = len(cycle_nodes)
         for i in range(n):
-            s = cycle_nodes[i]
-            r = cycle_nodes[(i + 1) % n]
-            for e in self._edges_by_source.get(s, []):
-                if e["target"] == r and pd.notna(e["ts"]):
-                    timestamps.append(e["ts"])
-        if not timestamps:
+            pair = (cycle_nodes[i], cycle_nodes[(i + 1) % n])
+            if pair in self._pair_ts_min:
+                firsts.append(self._pair_ts_min[pair])
+                lasts.append(self._pair_ts_max[pair])
+        if not firsts:
             return 0.0
-        span = max(timestamps) - min(timestamps)
+        span = max(lasts) - min(firsts)
         if span <= self.WINDOW_72H:
             return 8.0
         elif span <= pd.Timedelta("168h"):
@@ -181,13 +359,16 @@ class GraphEngine:
         suspicious: Dict[str, Dict] = {}
 
         for nid in self.node_stats:
-            senders   = list(self.rev.get(nid, set()))
-            receivers = list(self.adj.get(nid, set()))
+            # Degrees come straight off the stored sets; partner lists are only
+            # materialised for hubs that clear the threshold
+            sender_set   = self.rev.get(nid)
+            receiver_set = self.adj.get(nid)
 
             # Fan-in
-            if len(senders) >= self.SMURF_THRESHOLD:
-                in_ts = [e["ts"] for e in self._edges_by_target.get(nid, []) if pd.notna(e["ts"])]
-                window_count = self._max_in_window(in_ts, self.WINDOW_72H)
+            if sender_set and len(sender_set) >= self.SMURF_THRESHOLD:
+                senders = list(sender_set)
+                in_ts = self._edges_to(nid)[2]
+                window_count = self._max_in_window(in_ts, self.WINDOW_72H, assume_sorted=True)
                 score = min(100.0, 40 + (len(senders) - self.SMURF_THRESHOLD) * 3 + window_count * 2)
                 suspicious[nid] = {
                     "type": "fan_in",
@@ -197,9 +378,10 @@ class GraphEngine:
                 }
 
             # Fan-out
-            if len(receivers) >= self.SMURF_THRESHOLD:
-                out_ts = [e["ts"] for e in self._edges_by_source.get(nid, []) if pd.notna(e["ts"])]
-                window_count = self._max_in_window(out_ts, self.WINDOW_72H)
+            if receiver_set and len(receiver_set) >= self.SMURF_THRESHOLD:
+                receivers = list(receiver_set)
+                out_ts = self._edges_from(nid)[2]
+                window_count = self._max_in_window(out_ts, self.WINDOW_72H, assume_sorted=True)
                 score = min(100.0, 40 + (len(receivers) - self.SMURF_THRESHOLD) * 3 + window_count * 2)
                 if nid not in suspicious or suspicious[nid]["score"] < score:
                     suspicious[nid] = {
@@ -214,17 +396,25 @@ class GraphEngine:
     # ─── SHELL NETWORK DETECTION ──────────────────────────────────────────────
     def _detect_shell_networks(self) -> List[Dict]:
         shells: List[Dict] = []
-        seen_paths: Set[str] = set()
+        # Paths are tuples of int node IDs; names are only rebuilt for emitted shells
+        seen_paths: Set[Tuple[int, ...]] = set()
         total_steps = 0  # BFS step counter — guarantees termination
+        names = self._node_ids
+        adj = self._adj_sorted
+        shell_nodes = {
+            i for i, nid in enumerate(names)
+            if self.node_stats[nid].get("tx_total", 99) <= self.SHELL_MAX_TX
+        }
 
-        for start in sorted(self.node_stats.keys()):
+        for start in range(len(names)):
             if len(shells) >= self.MAX_SHELL_RESULTS:
                 break
             if total_steps >= self.SHELL_MAX_STEPS:
                 break
 
-            queue = [[start]]
-            enqueued: Set[str] = {start}
+            # Entries carry the shell count of the path's intermediaries so far
+            queue = deque([((start,), 0)])
+            enqueued: Set[int] = {start}
 
             while queue:
                 if total_steps >= self.SHELL_MAX_STEPS:
@@ -232,63 +422,62 @@ class GraphEngine:
                 if len(shells) >= self.MAX_SHELL_RESULTS:
                     break
 
-                path = queue.pop(0)
+                path, prev_count = queue.popleft()
                 total_steps += 1
 
                 if len(path) > 6:
                     continue
 
                 cur = path[-1]
-                for nxt in sorted(self.adj.get(cur, set())):
+                # Extending the path turns its current tail into an intermediary
+                shell_count = prev_count + (len(path) > 1 and cur in shell_nodes)
+                for nxt in adj[cur]:
                     if nxt in enqueued:
                         continue
-                    new_path = path + [nxt]
-                    path_key = "->".join(new_path)
-                    if path_key in seen_paths:
+                    new_path = path + (nxt,)
+                    if new_path in seen_paths:
                         continue
-                    seen_paths.add(path_key)
-
-                    intermediaries = new_path[1:-1]
-                    shell_count = sum(
-                        1 for n in intermediaries
-                        if self.node_stats.get(n, {}).get("tx_total", 99) <= self.SHELL_MAX_TX
-                    )
+                    seen_paths.add(new_path)
 
                     if len(new_path) >= self.SHELL_MIN_CHAIN and shell_count >= self.SHELL_MIN_INTERMEDIARY:
-                        shells.append({"path": new_path, "shell_count": shell_count})
+                        shells.append({"path": [names[i] for i in new_path], "shell_count": shell_count})
 
                     enqueued.add(nxt)
-                    queue.append(new_path)
+                    queue.append((new_path, shell_count))
 
         return shells[:self.MAX_SHELL_RESULTS]
 
     # ─── FALSE POSITIVE FILTER ────────────────────────────────────────────────
     def _get_legitimate_accounts(self) -> Set[str]:
-        legit: Set[str] = set()
-        for nid, stats in self.node_stats.items():
-            in_deg  = len(self.rev.get(nid, set()))
-            out_deg = len(self.adj.get(nid, set()))
-
-            # High-volume merchant: many unique senders, very few unique receivers,
-            # total inflow significantly > outflow
-            if (in_deg >= self.MERCHANT_IN_DEGREE
-                    and out_deg <= 5
-                    and stats["total_in"] > stats["total_out"] * 2.0):
-                legit.add(nid)
-
-            # Payroll: disperses to many unique recipients, funded by very few sources
-            if (out_deg >= self.PAYROLL_OUT_DEGREE
-                    and in_deg <= 3):
-                legit.add(nid)
-
-            # Payroll intermediary: single large inflow, many similar-sized outflows
-            if (stats["tx_in"] <= 3
-                    and stats["tx_out"] >= self.PAYROLL_OUT_DEGREE
-                    and stats["total_in"] > 0
-                    and abs(stats["total_in"] - stats["total_out"]) / stats["total_in"] < 0.15):
-                legit.add(nid)
-
-        return legit
+        # One boolean mask per rule over node-ordered stat arrays
+        names = self._node_ids
+        n = len(names)
+        stats = [self.node_stats[nid] for nid in names]
+        tx_in     = np.fromiter((st["tx_in"] for st in stats), dtype=np.int64, count=n)
+        tx_out    = np.fromiter((st["tx_out"] for st in stats), dtype=np.int64, count=n)
+        total_in  = np.fromiter((st["total_in"] for st in stats), dtype=np.float64, count=n)
+        total_out = np.fromiter((st["total_out"] for st in stats), dtype=np.float64, count=n)
+        # Unique-partner degrees straight from the adjacency CSR
+        out_deg = np.diff(self._indptr)
+        in_deg  = np.bincount(self._indices, minlength=n)
+
+        # High-volume merchant: many unique senders, very few unique receivers,
+        # total inflow significantly > outflow
+        merchant = ((in_deg >= self.MERCHANT_IN_DEGREE)
+                    & (out_deg <= 5)
+                    & (total_in > total_out * 2.0))
+
+        # Payroll: disperses to many unique recipients, funded by very few sources
+        payroll = (out_deg >= self.PAYROLL_OUT_DEGREE) & (in_deg <= 3)
+
+        # Payroll intermediary: single large inflow, many similar-sized outflows
+        imbalance = np.divide(np.abs(total_in - total_out), total_in,
+                              out=np.full(n, np.inf), where=total_in > 0)
+        payroll_interm = ((tx_in <= 3)
+                          & (tx_out >= self.PAYROLL_OUT_DEGREE)
+                          & (imbalance < 0.15))
+
+        return {names[i] for i in np.flatnonzero(merchant | payroll | payroll_interm)}
 
     # ─── RING CONSOLIDATION & SCORING ─────────────────────────────────────────
     def _build_rings_and_scores(
@@ -300,16 +489,18 @@ class GraphEngine:
     ) -> Tuple[List[Dict], List[Dict]]:
 
         account_flags: Dict[str, Dict] = defaultdict(lambda: {
-            "patterns": set(), "ring_id": None, "score": 0.0
+            "patterns": 0, "ring_id": None, "score": 0.0
         })
         rings: List[Dict] = []
         ring_counter = 1
+        pattern_bits = _pattern_bits(self.CYCLE_MIN, self.CYCLE_MAX)
+        pattern_table = sorted(pattern_bits.items())
 
         def flag(acc: str, pattern: str, ring_id, score: float):
             if acc in legit:
                 return
             f = account_flags[acc]
-            f["patterns"].add(pattern)
+            f["patterns"] |= pattern_bits[pattern]
             current = f["score"]
             f["score"] = min(100.0, current + score * (1 - current / 120.0))
             if ring_id and f["ring_id"] is None:
@@ -388,11 +579,10 @@ class GraphEngine:
 
         # ── High velocity bonus pass ─────────────────────────────────────────
         for acc in list(account_flags.keys()):
-            ts_list = [e["ts"] for e in self._edges_by_source.get(acc, [])
-                       + self._edges_by_target.get(acc, []) if pd.notna(e["ts"])]
+            ts_list = np.concatenate((self._edges_from(acc)[2], self._edges_to(acc)[2]))
             w = self._max_in_window(ts_list, self.WINDOW_24H)
             if w >= 6:
-                account_flags[acc]["patterns"].add("high_velocity")
+                account_flags[acc]["patterns"] |= pattern_bits["high_velocity"]
 
         # Deduplicate rings by member overlap
         deduped = self._deduplicate_rings(rings)
@@ -418,7 +608,7 @@ class GraphEngine:
             suspicious.append({
                 "account_id": acc,
                 "suspicion_score": round(min(100.0, flags["score"]), 1),
-                "detected_patterns": sorted(list(flags["patterns"])),
+                "detected_patterns": _decode_patterns(flags["patterns"], pattern_table),
                 "ring_id": assigned_ring or "RING_UNKNOWN",
             })
         suspicious.sort(key=lambda x: x["suspicion_score"], reverse=True)
@@ -427,15 +617,22 @@ class GraphEngine:
 
     def _deduplicate_rings(self, rings: List[Dict]) -> List[Dict]:
         kept, used_sets = [], []
+        # Inverted index member -> kept ring positions: only rings sharing a member
+        # can overlap, and the hit count per ring is the intersection size
+        member_to_rings: Dict[str, List[int]] = defaultdict(list)
         for ring in sorted(rings, key=lambda r: r["risk_score"], reverse=True):
             ms = set(ring["member_accounts"])
-            dup = False
-            for used in used_sets:
-                overlap = len(ms & used) / max(1, min(len(ms), len(used)))
-                if overlap > 0.85:
-                    dup = True
-                    break
+            shared: Dict[int, int] = defaultdict(int)
+            for m in ms:
+                for i in member_to_rings.get(m, ()):
+                    shared[i] += 1
+            dup = any(
+                n / max(1, min(len(ms), len(used_sets[i]))) > 0.85
+                for i, n in shared.items()
+            )
             if not dup:
+                for m in ms:
+                    member_to_rings[m].append(len(used_sets))
                 kept.append(ring)
                 used_sets.append(ms)
         # Re-number sequentially after dedup
@@ -478,18 +675,25 @@ class GraphEngine:
             for nid in sorted(display_set)
         ]
 
-        seen_edges: Set[str] = set()
-        edges = []
-        for e in self.edge_list:
-            if e["source"] in display_set and e["target"] in display_set:
-                key = f"{e['source']}|{e['target']}"
-                if key not in seen_edges:
-                    seen_edges.add(key)
-                    edges.append({
-                        "source": e["source"],
-                        "target": e["target"],
-                        "amount": round(e["amount"], 2),
-                    })
+        # Keep edges with both ends displayed, then the first row of each (source, target)
+        names = self._node_ids
+        n = len(names)
+        display_mask = np.zeros(n, dtype=bool)
+        display_mask[[self._id_of[nid] for nid in display_set]] = True
+        rows = np.flatnonzero(display_mask[self._src] & display_mask[self._dst])
+        pair_keys = self._src[rows].astype(np.int64) * n + self._dst[rows]
+        _, first = np.unique(pair_keys, return_index=True)
+        rows = rows[np.sort(first)]
+
+        edges = [
+            {
+                "source": names[s],
+                "target": names[t],
+                "amount": round(amt, 2),
+            }
+            for s, t, amt in zip(self._src[rows].tolist(), self._dst[rows].tolist(),
+                                 self._amt[rows].tolist())
+        ]
 
         return {"nodes": nodes, "edges": edges}
     
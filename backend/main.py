@@ -4,6 +4,7 @@ from fastapi.responses import JSONResponse
 import pandas as pd
 import io
 import time
+from datetime import datetime
 from graph_engine import GraphEngine
 
 app = FastAPI(title="FinForge API", version="1.0.0")
@@ -17,6 +18,26 @@ app.add_middleware(
 )
 
 REQUIRED_COLUMNS = {"transaction_id", "sender_id", "receiver_id", "amount", "timestamp"}
+TEXT_COLUMNS = {"transaction_id", "sender_id", "receiver_id", "timestamp"}
+TIMESTAMP_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y/%m/%d %H:%M:%S", "%d/%m/%Y %H:%M:%S")
+
+
+def _matches_format(value: str, fmt: str) -> bool:
+    try:
+        datetime.strptime(value, fmt)
+        return True
+    except ValueError:
+        return False
+
+
+def _read_csv(contents: bytes, encoding: str) -> pd.DataFrame:
+    # ids/timestamps stay text; amount is left to the C parser so a clean column
+    # arrives as float64 without a second conversion pass. The dtype map needs the
+    # raw header names exactly as pandas sees them (blank lines, BOM, quoting), so
+    # read just the header first; nrows=0 stops before any data row is parsed
+    header = pd.read_csv(io.BytesIO(contents), nrows=0, encoding=encoding).columns
+    dtypes = {c: str for c in header if c.strip().lower() in TEXT_COLUMNS}
+    return pd.read_csv(io.BytesIO(contents), dtype=dtypes, encoding=encoding, engine="c")
 
 
 @app.get("/")
@@ -36,14 +57,12 @@ async def analyze(file: UploadFile = File(...)):
 
     contents = await file.read()
 
-    # try utf-8 first, fall back to latin-1
     try:
-        text = contents.decode("utf-8")
-    except UnicodeDecodeError:
-        text = contents.decode("latin-1")
-
-    try:
-        df = pd.read_csv(io.StringIO(text), dtype=str)
+        # try utf-8 first, fall back to latin-1
+        try:
+            df = _read_csv(contents, "utf-8")
+        except UnicodeDecodeError:
+            df = _read_csv(contents, "latin-1")
         df.columns = [c.strip().lower() for c in df.columns]
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Could not parse CSV: {str(e)}")
@@ -53,18 +72,31 @@ async def analyze(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail=f"Missing required columns: {', '.join(missing)}")
 
     df = df.dropna(subset=["sender_id", "receiver_id"]).copy()
-    df.loc[:, "amount"] = pd.to_numeric(df["amount"], errors="coerce").fillna(0)
-
-    # try common formats explicitly to avoid the dateutil warning
-    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y/%m/%d %H:%M:%S", "%d/%m/%Y %H:%M:%S"):
+    amount = df["amount"]
+    if pd.api.types.is_bool_dtype(amount) or not pd.api.types.is_numeric_dtype(amount):
+        # non-numeric values in the column are treated like missing amounts; coerce
+        # from the text, since True/False infer as bools that to_numeric keeps as 1/0
+        df["amount"] = pd.to_numeric(amount.astype(str), errors="coerce")
+    df["amount"] = df["amount"].fillna(0)
+
+    # try common formats explicitly to avoid the dateutil warning; probe one value
+    # first so the full column is only parsed with formats that can possibly match
+    present = df["timestamp"].dropna()
+    sample = str(present.iloc[0]) if len(present) else ""
+    candidates = [fmt for fmt in TIMESTAMP_FORMATS if _matches_format(sample, fmt)]
+    for fmt in candidates:
         try:
             df.loc[:, "timestamp"] = pd.to_datetime(df["timestamp"], format=fmt, errors="raise")
             break
         except Exception:
             continue
     else:
-        # if none matched, fall back silently
-        df.loc[:, "timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
+        # if none matched, fall back silently; mixed UTC offsets only parse to one
+        # datetime64 column once normalised to UTC
+        df.loc[:, "timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce", utc=True)
+
+    # rows without a usable timestamp are dropped here once, so the engine never sees NaT
+    df = df.dropna(subset=["timestamp"])
 
     t0 = time.time()
     engine = GraphEngine(df)
@@ -0,0 +1,14 @@
+import main
+
+
+def test_ids_stay_text_after_leading_blank_line():
+    df = main._read_csv(
+        b"\n"
+        b"transaction_id,Sender_ID,receiver_id,amount,timestamp\n"
+        b"T1,007,008,5,2024-01-01 10:00:00\n"
+        b"T2,,010,7.5,2024-01-01 11:00:00\n",
+        "utf-8",
+    )
+    assert df["Sender_ID"].tolist()[0] == "007"
+    assert df["receiver_id"].tolist() == ["008", "010"]
+    assert df["amount"].dtype == "float64"
@@ -0,0 +1,40 @@
+import asyncio
+import io
+import json
+from datetime import datetime
+
+from fastapi import UploadFile
+import pandas as pd
+
+import main
+from graph_engine import GraphEngine
+
+
+def _analyze(csv_text: str) -> dict:
+    upload = UploadFile(file=io.BytesIO(csv_text.encode()), filename="upload.csv")
+    response = asyncio.run(main.analyze(upload))
+    return json.loads(response.body)
+
+
+def test_mixed_utc_offsets_are_analyzed():
+    result = _analyze(
+        "transaction_id,sender_id,receiver_id,amount,timestamp\n"
+        "T1,A,B,100,2024-01-01T10:00:00+05:00\n"
+        "T2,B,C,90,2024-01-01T11:00:00+00:00\n"
+        "T3,C,A,80,2024-01-01T12:00:00+00:00\n"
+    )
+    assert result["summary"]["total_transactions"] == 3
+    assert result["summary"]["cycles_found"] == 1
+
+
+def test_engine_accepts_tz_aware_object_column():
+    # an object column of tz-aware datetimes with mixed offsets
+    stamps = pd.Series([datetime.fromisoformat(s) for s in ("2024-01-01T10:00:00+05:00",
+                                                             "2024-01-01T11:00:00+00:00",
+                                                             "2024-01-01T12:00:00+00:00")],
+                       dtype=object)
+    df = pd.DataFrame({"transaction_id": ["T1", "T2", "T3"], "sender_id": ["A", "B", "C"],
+                       "receiver_id": ["B", "C", "A"], "amount": [100.0, 90.0, 80.0],
+                       "timestamp": stamps})
+    result = GraphEngine(df).run()
+    assert result["summary"]["cycles_found"] == 1